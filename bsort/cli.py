@@ -1,7 +1,19 @@
+import os
+
 import click
 import yaml
 from ultralytics import YOLO
 from .detect import run_inference
+from .mine import ActiveLearningMiner
+from .tracking import (
+    DEFAULT_METRIC,
+    MetricsStore,
+    TrainingTracker,
+    import_run_dir,
+    sync_to_wandb,
+)
+
+DEFAULT_STORE = "runs/bsort_store.db"
 
 
 def load_config(path):
@@ -39,7 +51,31 @@ def train(config):
     click.echo("Starting training with YOLO...")
 
     model = YOLO(cfg["model"])
-    model.train(**yolo_args)
+
+    store = tracker = None
+    if cfg.get("tracking") == "local":
+        # Keep W&B out of the training loop; runs can be synced later with `bsort runs sync`
+        os.environ["WANDB_MODE"] = "disabled"
+        store = MetricsStore(cfg.get("store", DEFAULT_STORE))
+        tracker = TrainingTracker(store, cfg["project"], cfg["name"])
+        tracker.register(model)
+
+    try:
+        model.train(**yolo_args)
+    except BaseException as exc:
+        if tracker is not None and tracker.run_id is not None:
+            kind = "interrupted" if isinstance(exc, KeyboardInterrupt) else "failed"
+            store.log_event(tracker.run_id, kind)
+        if store is not None:
+            # Don't let a store error replace the training error
+            try:
+                store.close()
+            except Exception as close_exc:  # pylint: disable=broad-except
+                click.echo(f"[WARN] Could not write run to metrics store: {close_exc}", err=True)
+        raise
+
+    if store is not None:
+        store.close()
 
     click.echo("Training complete!")
 
@@ -56,9 +92,190 @@ def infer(config, image):
     save_dir = cfg["project"] + "/" + cfg["name"]
 
     click.echo("Running inference...")
-    result = run_inference(model_path, image, save_dir)
+    result = run_inference(
+        model_path,
+        image,
+        save_dir,
+        render=cfg.get("render", True),
+        render_workers=cfg.get("render_workers", 2),
+        render_queue=cfg.get("render_queue", 32),
+        jpeg_quality=cfg.get("jpeg_quality", 85),
+        jpeg_subsampling=str(cfg.get("jpeg_subsampling", "420")),
+    )
     click.echo(f"Results saved to: {save_dir}")
 
 
+# ----- MINE COMMAND -----
+@click.command()
+@click.option('--config', required=True, help='Path to YAML configuration file')
+@click.option('--pool', required=True, help='Directory of unlabeled images to score')
+def mine(config, pool):
+    """Rank unlabeled images by model uncertainty for labeling."""
+    cfg = load_config(config)["mine"]
+
+    save_dir = cfg["project"] + "/" + cfg["name"]
+
+    miner = ActiveLearningMiner(
+        model_path=cfg["model"],
+        pool_dir=pool,
+        out_dir=save_dir,
+        batch=cfg.get("batch", 32),
+        workers=cfg.get("workers", 4),
+        imgsz=cfg.get("imgsz", 640),
+        conf=cfg.get("conf", 0.05),
+        top_k=cfg.get("top_k", 500),
+    )
+
+    click.echo("Mining unlabeled pool...")
+    miner.run()
+    click.echo(f"Shortlist saved to: {save_dir}")
+
+
+# ----- RUNS COMMANDS -----
+@click.group()
+def runs():
+    """Query and compare runs in the local metrics store."""
+    pass
+
+
+store_option = click.option('--store', default=DEFAULT_STORE, show_default=True,
+                            help='Path to the local metrics store')
+metric_option = click.option('--metric', default=DEFAULT_METRIC, show_default=True,
+                             help='Metric key to rank by')
+min_option = click.option('--min', 'minimize', is_flag=True,
+                          help='Lower is better (e.g. losses)')
+
+
+def open_store(path):
+    if not os.path.exists(path):
+        raise click.ClickException(f"No metrics store at {path}")
+    return MetricsStore(path)
+
+
+def resolve_run(store, ref):
+    run_id = store.find_run(ref)
+    if run_id is None:
+        raise click.ClickException(f"Unknown run: {ref}")
+    return run_id
+
+
+@runs.command(name="list")
+@store_option
+@metric_option
+@min_option
+def list_runs(store, metric, minimize):
+    """List runs with their status and best metric."""
+    db = open_store(store)
+    best = db.best_per_run(metric, mode="min" if minimize else "max")
+
+    click.echo(f"{'id':>4}  {'name':<28}{'status':<13}{'synced':<8}"
+               f"{'epochs':>7}{'best':>10}{'@epoch':>8}")
+    for run in db.runs():
+        value, step = best.get(run["id"], (None, None))
+        value = f"{value:.5f}" if value is not None else "-"
+        synced = "yes" if run["synced"] else "no"
+        click.echo(f"{run['id']:>4}  {run['name']:<28}{run['status'] or '-':<13}{synced:<8}"
+                   f"{run['epochs'] or 0:>7}{value:>10}{step or '-':>8}")
+    db.close()
+
+
+@runs.command()
+@store_option
+@metric_option
+@click.option('--by', default="model,freeze,epochs", show_default=True,
+              help='Comma-separated params that define a config')
+@min_option
+def best(store, metric, by, minimize):
+    """Best metric per config."""
+    db = open_store(store)
+    group_by = [k.strip() for k in by.split(",") if k.strip()]
+    rows = db.best_per_config(metric, group_by, mode="min" if minimize else "max")
+
+    click.echo("".join(f"{k:<14}" for k in group_by) + f"{'best':>10}{'@epoch':>8}  run")
+    for row in rows:
+        click.echo("".join(f"{str(row[k]):<14}" for k in group_by)
+                   + f"{row['best']:>10.5f}{row['epoch']:>8}  {row['run']}")
+    db.close()
+
+
+@runs.command()
+@store_option
+@metric_option
+@click.option('--tolerance', default=0.01, show_default=True,
+              help='Relative distance from the best value that counts as plateaued')
+@min_option
+def plateau(store, metric, tolerance, minimize):
+    """Epochs until each run's metric plateaued."""
+    db = open_store(store)
+    mode = "min" if minimize else "max"
+
+    click.echo(f"{'id':>4}  {'name':<28}{'epochs':>7}{'plateau':>9}")
+    for run in db.runs():
+        epoch = db.epochs_to_plateau(run["id"], metric, tolerance, mode=mode)
+        click.echo(f"{run['id']:>4}  {run['name']:<28}{run['epochs'] or 0:>7}{epoch or '-':>9}")
+    db.close()
+
+
+@runs.command()
+@store_option
+@click.argument('run_refs', nargs=-1, required=True)
+def compare(store, run_refs):
+    """Compare best and final values of every metric across runs."""
+    db = open_store(store)
+    run_ids = [resolve_run(db, ref) for ref in run_refs]
+    keys = sorted({k for run_id in run_ids for k in db.metric_keys(run_id)})
+
+    click.echo(f"{'metric':<24}" + "".join(f"{str(ref)[:24]:>26}" for ref in run_refs))
+    for key in keys:
+        cells = []
+        for run_id in run_ids:
+            series = db.series(run_id, key)
+            if series:
+                values = [v for _, v in series]
+                top = min(values) if "loss" in key else max(values)
+                cells.append(f"{top:.5f} / {values[-1]:.5f}")
+            else:
+                cells.append("-")
+        click.echo(f"{key:<24}" + "".join(f"{c:>26}" for c in cells))
+    click.echo("(best / final)")
+    db.close()
+
+
+@runs.command(name="import")
+@store_option
+@click.option('--force', is_flag=True, help='Import folders again even if already imported')
+@click.argument('run_dirs', nargs=-1, required=True)
+def import_runs(store, force, run_dirs):
+    """Import existing run folders (args.yaml + results.csv)."""
+    db = MetricsStore(store)
+    for run_dir in run_dirs:
+        existing = db.find_imported(run_dir)
+        if existing is not None and not force:
+            click.echo(f"[WARN] Skip {run_dir}: already imported as run {existing} (use --force)")
+            continue
+        run_id = import_run_dir(db, run_dir, force=force)
+        click.echo(f"Imported {run_dir} as run {run_id}")
+    db.close()
+
+
+@runs.command()
+@store_option
+@click.option('--project', default=None, help='W&B project (defaults to the run project)')
+@click.argument('run_refs', nargs=-1, required=True)
+def sync(store, project, run_refs):
+    """Upload stored runs to Weights & Biases."""
+    db = open_store(store)
+    for ref in run_refs:
+        run_id = resolve_run(db, ref)
+        try:
+            sync_to_wandb(db, run_id, project)
+        except ImportError as exc:
+            raise click.ClickException("wandb is not installed: pip install wandb") from exc
+        click.echo(f"Synced run {ref} to W&B")
+    db.close()
+
+
 cli.add_command(train)
 cli.add_command(infer)
+cli.add_command(mine)
+cli.add_command(runs)
@@ -1,11 +1,69 @@
+import os
+
 from ultralytics import YOLO
+from ultralytics.data.utils import VID_FORMATS
+
+from .render import AsyncRenderer
+
+STREAM_PREFIXES = ("rtsp://", "rtmp://", "tcp://", "http://", "https://")
+
+
+def is_video_source(source):
+    """True for webcams, stream URLs, video files and folders that contain videos."""
+    source = str(source)
+    if source.isnumeric() or source.lower().startswith(STREAM_PREFIXES):
+        return True
+    if os.path.isdir(source):
+        return any(f.rsplit(".", 1)[-1].lower() in VID_FORMATS for f in os.listdir(source))
+    return source.rsplit(".", 1)[-1].lower() in VID_FORMATS
+
 
-def run_inference(model_path, source, save_dir="runs/bsort"):
+def run_inference(model_path, source, save_dir="runs/bsort", render=True, render_workers=2,
+                  render_queue=32, jpeg_quality=85, jpeg_subsampling="420"):
+    """
+    Run detection on `source` and hand annotated-image rendering to a background stage.
+
+    Video and stream sources keep ultralytics' own annotated-video output
+    (save=True) instead of per-frame JPEGs from the render stage.
+    """
     model = YOLO(model_path)
-    results = model.predict(
-        source=source,
-        save=True,
-        project=save_dir,
-        name="predictions"
-    )
+
+    if is_video_source(source):
+        return list(model.predict(
+            source=source,
+            save=render,
+            project=save_dir,
+            name="predictions",
+            stream=True,
+        ))
+
+    renderer = None
+    if render:
+        renderer = AsyncRenderer(
+            out_dir=os.path.join(save_dir, "predictions"),
+            names=[model.names[i] for i in sorted(model.names)],
+            workers=render_workers,
+            queue_size=render_queue,
+            quality=jpeg_quality,
+            subsampling=jpeg_subsampling,
+        )
+
+    results = []
+    try:
+        for result in model.predict(source=source, save=False, stream=True, verbose=False):
+            if renderer is not None:
+                boxes = result.boxes
+                renderer.submit(
+                    result.orig_img,
+                    boxes.xyxy.cpu().numpy(),
+                    boxes.cls.cpu().numpy(),
+                    boxes.conf.cpu().numpy(),
+                    os.path.basename(result.path),
+                )
+            results.append(result)
+    finally:
+        if renderer is not None:
+            renderer.close()
+            print(f"[INFO] Rendered {renderer.rendered} images, dropped {renderer.dropped}.")
+
     return results
@@ -0,0 +1,223 @@
+import csv
+import heapq
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import cv2
+from tqdm import tqdm
+
+from .utils import (
+    class_margin_score,
+    flip_boxes_lr,
+    max_confidence_score,
+    tta_disagreement_score,
+)
+
+IMAGE_EXTS = (".jpg", ".jpeg", ".png", ".bmp")
+
+
+class ActiveLearningMiner:
+    """
+    Score an unlabeled image pool by model uncertainty and write a ranked shortlist.
+
+    Images are decoded by a thread pool one batch ahead of inference. Every
+    finished image is appended to `scores.jsonl` under its absolute path, so an
+    interrupted run skips what is already scored when restarted with the same
+    output directory, however `pool_dir` is spelled.
+    """
+
+    def __init__(self, model_path, pool_dir, out_dir, batch=32, workers=4,
+                 imgsz=640, conf=0.05, top_k=500, weights=(1.0, 1.0, 1.0)):
+        self.model_path = model_path
+        self.pool_dir = pool_dir
+        self.out_dir = out_dir
+        self.batch = batch
+        self.workers = workers
+        self.imgsz = imgsz
+        self.conf = conf
+        self.top_k = top_k
+        self.weights = weights
+
+        self.scores_path = os.path.join(self.out_dir, "scores.jsonl")
+        self.shortlist_path = os.path.join(self.out_dir, "shortlist.csv")
+
+        os.makedirs(self.out_dir, exist_ok=True)
+
+    def iter_pool(self):
+        """Yield absolute image paths in the pool directory (recursive, sorted per folder)."""
+        for root, dirs, files in os.walk(os.path.abspath(self.pool_dir)):
+            dirs.sort()
+            for fname in sorted(files):
+                if fname.lower().endswith(IMAGE_EXTS):
+                    yield os.path.join(root, fname)
+
+    def load_checkpoint(self):
+        """Return the set of image paths already recorded in scores.jsonl."""
+        done = set()
+        if not os.path.exists(self.scores_path):
+            return done
+
+        with open(self.scores_path, "r") as f:
+            for line in f:
+                try:
+                    done.add(os.path.abspath(json.loads(line)["image"]))
+                except (ValueError, KeyError):
+                    # Partially written last line from an interrupted run
+                    continue
+        return done
+
+    def repair_checkpoint(self):
+        """Cut a torn last line left by an interrupted run so new records start on a fresh line."""
+        if not os.path.exists(self.scores_path):
+            return
+
+        with open(self.scores_path, "rb+") as f:
+            size = f.seek(0, os.SEEK_END)
+            if size == 0:
+                return
+            f.seek(size - 1)
+            if f.read(1) == b"\n":
+                return
+
+            # Scan back in chunks for the last complete line
+            pos = size
+            while pos > 0:
+                start = max(0, pos - 65536)
+                f.seek(start)
+                chunk = f.read(pos - start)
+                idx = chunk.rfind(b"\n")
+                if idx != -1:
+                    f.truncate(start + idx + 1)
+                    return
+                pos = start
+            f.truncate(0)
+
+    def iter_batches(self, done):
+        """Yield lists of pending image paths of size `batch`."""
+        batch = []
+        for path in self.iter_pool():
+            if path in done:
+                continue
+            batch.append(path)
+            if len(batch) == self.batch:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+    def score_frame(self, result, flipped_result, width):
+        """Compute uncertainty scores for one frame from original and flipped predictions."""
+        boxes = result.boxes.xyxy.cpu().numpy()
+        confs = result.boxes.conf.cpu().numpy()
+        classes = result.boxes.cls.cpu().numpy()
+
+        flipped_boxes = flip_boxes_lr(flipped_result.boxes.xyxy.cpu().numpy(), width)
+        flipped_classes = flipped_result.boxes.cls.cpu().numpy()
+
+        max_conf = max_confidence_score(confs)
+        margin = class_margin_score(boxes, confs, classes)
+        tta = tta_disagreement_score(boxes, classes, flipped_boxes, flipped_classes)
+
+        w_conf, w_margin, w_tta = self.weights
+        score = (w_conf * max_conf + w_margin * margin + w_tta * tta) / sum(self.weights)
+
+        return {
+            "score": round(score, 6),
+            "max_conf_score": round(max_conf, 6),
+            "margin_score": round(margin, 6),
+            "tta_score": round(tta, 6),
+            "detections": int(len(boxes)),
+        }
+
+    def mine(self):
+        """Stream the pool through the model and append scores to the checkpoint."""
+        # Imported here so checkpoint and shortlist handling work without the model stack
+        from ultralytics import YOLO  # pylint: disable=import-outside-toplevel
+
+        self.repair_checkpoint()
+        done = self.load_checkpoint()
+        if done:
+            print(f"[INFO] Resuming: {len(done)} images already scored.")
+
+        model = YOLO(self.model_path)
+
+        with open(self.scores_path, "a") as out, \
+                ThreadPoolExecutor(max_workers=self.workers) as executor:
+            batches = self.iter_batches(done)
+            pending = None
+
+            first = next(batches, None)
+            if first is not None:
+                pending = (first, executor.map(cv2.imread, first))
+
+            progress = tqdm(desc="Mining", unit="img")
+            while pending is not None:
+                paths, frames = pending
+                frames = list(frames)
+
+                # Start decoding the next batch while this one is on the model
+                nxt = next(batches, None)
+                pending = (nxt, executor.map(cv2.imread, nxt)) if nxt is not None else None
+
+                valid = [(p, f) for p, f in zip(paths, frames) if f is not None]
+                for p, f in zip(paths, frames):
+                    if f is None:
+                        print(f"[WARN] Skip: cannot decode {p}")
+                        out.write(json.dumps({"image": p, "error": "unreadable"}) + "\n")
+
+                if valid:
+                    images = [f for _, f in valid]
+                    flipped = [cv2.flip(f, 1) for f in images]
+                    results = model.predict(
+                        source=images + flipped,
+                        imgsz=self.imgsz,
+                        conf=self.conf,
+                        batch=len(images) * 2,
+                        verbose=False,
+                    )
+
+                    n = len(images)
+                    for k, (path, frame) in enumerate(valid):
+                        record = {"image": path}
+                        record.update(self.score_frame(results[k], results[n + k], frame.shape[1]))
+                        out.write(json.dumps(record) + "\n")
+
+                out.flush()
+                os.fsync(out.fileno())
+                progress.update(len(paths))
+            progress.close()
+
+    def write_shortlist(self):
+        """Rank all scored images and write the top_k most uncertain to shortlist.csv."""
+        # Keyed by absolute path so an image scored twice is listed once (latest record wins)
+        latest = {}
+        with open(self.scores_path, "r") as f:
+            for line in f:
+                try:
+                    rec = json.loads(line)
+                except ValueError:
+                    continue
+                if "score" in rec:
+                    rec["image"] = os.path.abspath(rec["image"])
+                    latest[rec["image"]] = rec
+
+        top = heapq.nlargest(self.top_k, latest.values(), key=lambda r: r["score"])
+
+        fields = ["rank", "image", "score", "max_conf_score", "margin_score", "tta_score", "detections"]
+        with open(self.shortlist_path, "w", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=fields)
+            writer.writeheader()
+            for rank, rec in enumerate(top, start=1):
+                writer.writerow({"rank": rank, **{k: rec[k] for k in fields[1:]}})
+
+        return top
+
+    def run(self):
+        """Execute mining and write the ranked shortlist."""
+        self.mine()
+        top = self.write_shortlist()
+
+        print(f"[INFO] Shortlisted {len(top)} images for labeling.")
+        print(f"Scores    : {os.path.abspath(self.scores_path)}")
+        print(f"Shortlist : {os.path.abspath(self.shortlist_path)}")
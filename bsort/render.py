@@ -0,0 +1,181 @@
+import os
+import queue
+import threading
+
+import cv2
+import numpy as np
+
+# BGR colour per class: light_blue, dark_blue, other
+CLASS_COLORS = np.array([
+    [230, 200, 120],
+    [140, 40, 20],
+    [60, 180, 60],
+], dtype=np.uint8)
+
+JPEG_SUBSAMPLING = {
+    "444": getattr(cv2, "IMWRITE_JPEG_SAMPLING_FACTOR_444", None),
+    "422": getattr(cv2, "IMWRITE_JPEG_SAMPLING_FACTOR_422", None),
+    "420": getattr(cv2, "IMWRITE_JPEG_SAMPLING_FACTOR_420", None),
+}
+
+
+def _ranges(starts, lengths):
+    """Concatenate arange(s, s + n) for every (s, n) pair without a Python loop."""
+    offsets = np.repeat(np.cumsum(lengths) - lengths, lengths)
+    return np.arange(lengths.sum()) - offsets + np.repeat(starts, lengths)
+
+
+def draw_boxes(frame, boxes, classes, thickness=2):
+    """
+    Draw box outlines for all detections in place.
+
+    Border pixel coordinates for every box are built at once with numpy and
+    written with a single fancy-index assignment per edge ring, instead of
+    one cv2.rectangle call per box.
+    """
+    boxes = np.asarray(boxes, dtype=np.float32).reshape(-1, 4)
+    if len(boxes) == 0:
+        return frame
+
+    h, w = frame.shape[:2]
+    x1, y1, x2, y2 = np.round(boxes).astype(np.int64).T
+    x1, x2 = np.clip(x1, 0, w - 1), np.clip(x2, 0, w - 1)
+    y1, y2 = np.clip(y1, 0, h - 1), np.clip(y2, 0, h - 1)
+
+    classes = np.asarray(classes).astype(np.int64)
+    colors = CLASS_COLORS[np.clip(classes, 0, len(CLASS_COLORS) - 1)]
+
+    widths = np.maximum(x2 - x1 + 1, 1)
+    heights = np.maximum(y2 - y1 + 1, 1)
+    box_ids = np.arange(len(boxes))
+
+    xs_h = _ranges(x1, widths)
+    ids_h = np.repeat(box_ids, widths)
+    ys_v = _ranges(y1, heights)
+    ids_v = np.repeat(box_ids, heights)
+
+    for k in range(thickness):
+        top = np.clip(y1 + k, 0, h - 1)
+        bottom = np.clip(y2 - k, 0, h - 1)
+        left = np.clip(x1 + k, 0, w - 1)
+        right = np.clip(x2 - k, 0, w - 1)
+
+        ys = np.concatenate([top[ids_h], bottom[ids_h], ys_v, ys_v])
+        xs = np.concatenate([xs_h, xs_h, left[ids_v], right[ids_v]])
+        ids = np.concatenate([ids_h, ids_h, ids_v, ids_v])
+        frame[ys, xs] = colors[ids]
+
+    return frame
+
+
+def draw_labels(frame, boxes, classes, confs, names):
+    """Write `name conf` above each box."""
+    for (x1, y1, _, _), cls, conf in zip(np.asarray(boxes).reshape(-1, 4), classes, confs):
+        cls = int(cls)
+        name = names[cls] if cls < len(names) else str(cls)
+        color = tuple(int(c) for c in CLASS_COLORS[min(cls, len(CLASS_COLORS) - 1)])
+        cv2.putText(frame, f"{name} {conf:.2f}", (int(x1), max(int(y1) - 4, 10)),
+                    cv2.FONT_HERSHEY_SIMPLEX, 0.4, color, 1, cv2.LINE_AA)
+    return frame
+
+
+def check_subsampling(subsampling):
+    """Raise ValueError unless `subsampling` is one of 444, 422 or 420."""
+    if str(subsampling) not in JPEG_SUBSAMPLING:
+        raise ValueError(
+            f"Unknown jpeg_subsampling {subsampling!r}, expected one of {sorted(JPEG_SUBSAMPLING)}"
+        )
+
+
+def encode_jpeg(frame, quality=85, subsampling="420"):
+    """Encode a BGR frame to JPEG bytes with the given quality and chroma subsampling."""
+    check_subsampling(subsampling)
+    params = [cv2.IMWRITE_JPEG_QUALITY, int(quality), cv2.IMWRITE_JPEG_OPTIMIZE, 0]
+
+    # None only when this OpenCV build predates the sampling-factor flag
+    factor = JPEG_SUBSAMPLING[str(subsampling)]
+    if factor is not None:
+        params += [cv2.IMWRITE_JPEG_SAMPLING_FACTOR, factor]
+
+    ok, buf = cv2.imencode(".jpg", frame, params)
+    if not ok:
+        raise RuntimeError("JPEG encoding failed")
+    return buf.tobytes()
+
+
+class AsyncRenderer:
+    """
+    Draw detections and write annotated JPEGs on background worker threads.
+
+    Frames are handed over as already-decoded arrays (no second decode). Workers
+    draw on their own copy, so the caller's frame is never modified. The
+    queue is bounded: when workers fall behind, new renders are dropped
+    rather than blocking the detection loop.
+    """
+
+    def __init__(self, out_dir, names=("light_blue", "dark_blue", "other"), workers=2,
+                 queue_size=32, quality=85, subsampling="420", labels=True):
+        # Fail on a config typo before inference starts, not in a worker
+        check_subsampling(subsampling)
+
+        self.out_dir = out_dir
+        self.names = names
+        self.quality = quality
+        self.subsampling = subsampling
+        self.labels = labels
+
+        self.rendered = 0
+        self.dropped = 0
+        self._lock = threading.Lock()
+        self._queue = queue.Queue(maxsize=queue_size)
+
+        os.makedirs(self.out_dir, exist_ok=True)
+
+        self._workers = [
+            threading.Thread(target=self._work, daemon=True) for _ in range(workers)
+        ]
+        for t in self._workers:
+            t.start()
+
+    def submit(self, frame, boxes, classes, confs, fname):
+        """Queue one frame for rendering. Returns False if it was dropped."""
+        try:
+            self._queue.put_nowait((frame, boxes, classes, confs, fname))
+        except queue.Full:
+            with self._lock:
+                self.dropped += 1
+            return False
+        return True
+
+    def render(self, frame, boxes, classes, confs, fname):
+        """Draw and write a single annotated frame (runs on a worker)."""
+        frame = frame.copy()
+        draw_boxes(frame, boxes, classes)
+        if self.labels:
+            draw_labels(frame, boxes, classes, confs, self.names)
+
+        data = encode_jpeg(frame, self.quality, self.subsampling)
+        out_path = os.path.join(self.out_dir, os.path.splitext(fname)[0] + ".jpg")
+        with open(out_path, "wb") as f:
+            f.write(data)
+
+    def _work(self):
+        while True:
+            item = self._queue.get()
+            try:
+                if item is None:
+                    return
+                self.render(*item)
+                with self._lock:
+                    self.rendered += 1
+            except Exception as exc:  # pylint: disable=broad-except
+                print(f"[WARN] Render failed for {item[4]}: {exc}")
+            finally:
+                self._queue.task_done()
+
+    def close(self):
+        """Finish queued renders and stop the workers."""
+        for _ in self._workers:
+            self._queue.put(None)
+        for t in self._workers:
+            t.join()
@@ -0,0 +1,450 @@
+import csv
+import json
+import os
+import queue
+import sqlite3
+import threading
+import time
+
+import yaml
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    project TEXT NOT NULL,
+    name TEXT NOT NULL,
+    created REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS params (
+    run_id INTEGER NOT NULL,
+    key TEXT NOT NULL,
+    value TEXT
+);
+CREATE TABLE IF NOT EXISTS metrics (
+    run_id INTEGER NOT NULL,
+    step INTEGER NOT NULL,
+    key TEXT NOT NULL,
+    value REAL,
+    ts REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS artifacts (
+    run_id INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    path TEXT NOT NULL,
+    ts REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS events (
+    run_id INTEGER NOT NULL,
+    kind TEXT NOT NULL,
+    ts REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_params_run ON params (run_id, key);
+CREATE INDEX IF NOT EXISTS idx_metrics_key ON metrics (key, run_id, value);
+CREATE INDEX IF NOT EXISTS idx_metrics_run ON metrics (run_id, key, step);
+CREATE INDEX IF NOT EXISTS idx_events_run ON events (run_id, ts);
+"""
+
+DEFAULT_METRIC = "metrics/mAP50-95(B)"
+
+
+class MetricsStore:
+    """
+    Local append-only experiment store backed by SQLite.
+
+    Rows are only ever inserted: run status changes are recorded as events.
+    Metric, artifact and event writes are queued and committed in batches by a
+    background thread, so logging from the training loop never waits on disk.
+    A database error in the writer drops that batch and is re-raised by the
+    next `flush()` or `close()`.
+    """
+
+    def __init__(self, path, flush_interval=1.0, batch_size=500):
+        self.path = path
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(SCHEMA)
+        self._conn.commit()
+        self._lock = threading.Lock()
+
+        self._queue = queue.Queue()
+        self._writer = None
+        self._error = None
+
+    # ----- WRITES -----
+
+    def _ensure_writer(self):
+        if self._writer is None:
+            self._writer = threading.Thread(target=self._write_loop, daemon=True)
+            self._writer.start()
+
+    def _write_loop(self):
+        """Drain the queue and commit pending rows in batches."""
+        while True:
+            pending = []
+            try:
+                pending.append(self._queue.get(timeout=self.flush_interval))
+            except queue.Empty:
+                continue
+
+            while len(pending) < self.batch_size:
+                try:
+                    pending.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            stop = any(item is None for item in pending)
+            rows = {}
+            for item in pending:
+                if item is not None:
+                    sql, row = item
+                    rows.setdefault(sql, []).append(row)
+
+            try:
+                with self._lock:
+                    try:
+                        for sql, batch in rows.items():
+                            self._conn.executemany(sql, batch)
+                        self._conn.commit()
+                    except sqlite3.Error:
+                        self._conn.rollback()
+                        raise
+            except sqlite3.Error as exc:
+                self._error = exc
+            finally:
+                for _ in pending:
+                    self._queue.task_done()
+
+            if stop:
+                return
+
+    def _raise_error(self):
+        """Re-raise (once) a database error hit by the writer thread."""
+        if self._error is not None:
+            error, self._error = self._error, None
+            raise error
+
+    def _put(self, sql, row):
+        self._ensure_writer()
+        self._queue.put((sql, row))
+
+    def start_run(self, project, name, params=None):
+        """Create a run, record its params and return its id (synchronous)."""
+        now = time.time()
+        with self._lock:
+            cur = self._conn.execute(
+                "INSERT INTO runs (project, name, created) VALUES (?, ?, ?)", (project, name, now)
+            )
+            run_id = cur.lastrowid
+            self._conn.executemany(
+                "INSERT INTO params (run_id, key, value) VALUES (?, ?, ?)",
+                [(run_id, k, json.dumps(v, default=str)) for k, v in (params or {}).items()],
+            )
+            self._conn.execute(
+                "INSERT INTO events (run_id, kind, ts) VALUES (?, ?, ?)", (run_id, "started", now)
+            )
+            self._conn.commit()
+        return run_id
+
+    def log_metrics(self, run_id, step, metrics):
+        """Queue a dict of scalar metrics for one step."""
+        now = time.time()
+        for key, value in metrics.items():
+            self._put(
+                "INSERT INTO metrics (run_id, step, key, value, ts) VALUES (?, ?, ?, ?, ?)",
+                (run_id, int(step), key, float(value), now),
+            )
+
+    def log_artifact(self, run_id, name, path):
+        """Queue a reference to a file produced by the run."""
+        self._put(
+            "INSERT INTO artifacts (run_id, name, path, ts) VALUES (?, ?, ?, ?)",
+            (run_id, name, os.path.abspath(path), time.time()),
+        )
+
+    def log_event(self, run_id, kind):
+        """Queue a status event (finished, failed, synced, ...)."""
+        self._put("INSERT INTO events (run_id, kind, ts) VALUES (?, ?, ?)", (run_id, kind, time.time()))
+
+    def flush(self):
+        """Block until every queued write is committed; raise if any batch failed."""
+        self._queue.join()
+        self._raise_error()
+
+    def close(self):
+        """Flush pending writes, stop the writer and close the database."""
+        if self._writer is not None:
+            self._queue.put(None)
+            self._writer.join()
+            self._writer = None
+        self._conn.close()
+        self._raise_error()
+
+    # ----- QUERIES -----
+
+    def _query(self, sql, args=()):
+        with self._lock:
+            return self._conn.execute(sql, args).fetchall()
+
+    def runs(self):
+        """
+        All runs as dicts with their latest status, epoch count and sync state.
+
+        `synced` events don't change the training status; `synced` is True
+        once the run has been uploaded to W&B.
+        """
+        rows = self._query(
+            """
+            SELECT r.id, r.project, r.name, r.created,
+                   (SELECT kind FROM events e WHERE e.run_id = r.id AND e.kind != 'synced'
+                    ORDER BY e.ts DESC, e.rowid DESC LIMIT 1),
+                   (SELECT MAX(step) FROM metrics m WHERE m.run_id = r.id),
+                   EXISTS (SELECT 1 FROM events e WHERE e.run_id = r.id AND e.kind = 'synced')
+            FROM runs r ORDER BY r.id
+            """
+        )
+        keys = ("id", "project", "name", "created", "status", "epochs", "synced")
+        return [{**dict(zip(keys, row)), "synced": bool(row[-1])} for row in rows]
+
+    def find_imported(self, run_dir):
+        """Id of the latest run imported from `run_dir`, None if it was never imported."""
+        rows = self._query(
+            "SELECT run_id FROM artifacts WHERE name = 'source_dir' AND path = ? "
+            "ORDER BY run_id DESC LIMIT 1",
+            (os.path.abspath(run_dir),),
+        )
+        return rows[0][0] if rows else None
+
+    def find_run(self, ref):
+        """Resolve a run id or name (latest run with that name wins)."""
+        if str(ref).isdigit():
+            rows = self._query("SELECT id FROM runs WHERE id = ?", (int(ref),))
+        else:
+            rows = self._query("SELECT id FROM runs WHERE name = ? ORDER BY id DESC LIMIT 1", (ref,))
+        return rows[0][0] if rows else None
+
+    def params(self, run_id):
+        """Params of a run as a dict."""
+        rows = self._query("SELECT key, value FROM params WHERE run_id = ?", (run_id,))
+        return {k: json.loads(v) for k, v in rows}
+
+    def metric_keys(self, run_id):
+        """Metric names recorded for a run."""
+        return [r[0] for r in self._query(
+            "SELECT DISTINCT key FROM metrics WHERE run_id = ? ORDER BY key", (run_id,)
+        )]
+
+    def series(self, run_id, key):
+        """(step, value) pairs of one metric for a run, ordered by step."""
+        return self._query(
+            "SELECT step, value FROM metrics WHERE run_id = ? AND key = ? ORDER BY step",
+            (run_id, key),
+        )
+
+    def artifacts(self, run_id):
+        """(name, path) pairs logged for a run."""
+        return self._query("SELECT name, path FROM artifacts WHERE run_id = ? ORDER BY ts", (run_id,))
+
+    def best_per_run(self, key=DEFAULT_METRIC, mode="max"):
+        """{run_id: (best_value, step)} for one metric across all runs."""
+        agg = "MAX" if mode == "max" else "MIN"
+        rows = self._query(
+            f"""
+            SELECT m.run_id, m.value, MIN(m.step)
+            FROM metrics m
+            JOIN (SELECT run_id, {agg}(value) AS best FROM metrics
+                  WHERE key = ? GROUP BY run_id) b
+              ON b.run_id = m.run_id AND m.value = b.best
+            WHERE m.key = ?
+            GROUP BY m.run_id
+            """,
+            (key, key),
+        )
+        return {run_id: (value, step) for run_id, value, step in rows}
+
+    def best_per_config(self, key=DEFAULT_METRIC, group_by=("model", "freeze", "epochs"), mode="max"):
+        """
+        Best value of `key` for every distinct combination of `group_by` params.
+
+        Returns a list of dicts sorted best-first with the config values, the
+        winning run and the epoch it was reached at.
+        """
+        best = self.best_per_run(key, mode)
+        if not best:
+            return []
+
+        placeholders = ",".join("?" * len(group_by))
+        rows = self._query(
+            f"SELECT run_id, key, value FROM params WHERE key IN ({placeholders})", tuple(group_by)
+        )
+        configs = {}
+        for run_id, k, v in rows:
+            configs.setdefault(run_id, {})[k] = json.loads(v)
+
+        names = dict(self._query("SELECT id, name FROM runs"))
+        groups = {}
+        for run_id, (value, step) in best.items():
+            cfg = configs.get(run_id, {})
+            values = [cfg.get(k) for k in group_by]
+            # Params can be lists (e.g. freeze: [0, 1, 2]), so key on their JSON form
+            config = json.dumps(values, sort_keys=True, default=str)
+            current = groups.get(config)
+            better = current is None or (value > current["best"] if mode == "max" else value < current["best"])
+            if better:
+                groups[config] = {
+                    **dict(zip(group_by, values)),
+                    "best": value,
+                    "epoch": step,
+                    "run": names[run_id],
+                    "run_id": run_id,
+                }
+
+        return sorted(groups.values(), key=lambda g: g["best"], reverse=(mode == "max"))
+
+    def epochs_to_plateau(self, run_id, key=DEFAULT_METRIC, tolerance=0.01, mode="max"):
+        """
+        First epoch at which `key` came within `tolerance` (relative) of its best value.
+
+        Use mode="min" for metrics where lower is better (losses). Returns None
+        when the run has no values for `key`.
+        """
+        series = self.series(run_id, key)
+        if not series:
+            return None
+
+        if mode == "max":
+            best = max(v for _, v in series)
+            threshold = best - abs(best) * tolerance
+            return next(step for step, v in series if v >= threshold)
+
+        best = min(v for _, v in series)
+        threshold = best + abs(best) * tolerance
+        return next(step for step, v in series if v <= threshold)
+
+
+class TrainingTracker:
+    """
+    Ultralytics callbacks that log a training run into a MetricsStore.
+
+    Params are recorded at train start, per-epoch losses, metrics and
+    learning rates at each fit-epoch end, and weights and results files as
+    artifacts when training ends. Ultralytics fires fit-epoch-end once more
+    after validating best.pt with the epoch unchanged; those metrics are
+    stored under a `final/` prefix so they don't duplicate the last epoch.
+    """
+
+    def __init__(self, store, project, name):
+        self.store = store
+        self.project = project
+        self.name = name
+        self.run_id = None
+        self._last_step = None
+
+    def on_train_start(self, trainer):
+        self.run_id = self.store.start_run(self.project, self.name, vars(trainer.args))
+
+    def on_fit_epoch_end(self, trainer):
+        step = trainer.epoch + 1
+        if step == self._last_step:
+            # Final evaluation of best.pt
+            final = {f"final/{k}": v for k, v in trainer.metrics.items()}
+            self.store.log_metrics(self.run_id, step, final)
+            return
+
+        metrics = dict(trainer.label_loss_items(trainer.tloss, prefix="train"))
+        metrics.update(trainer.metrics)
+        metrics.update(trainer.lr)
+        self.store.log_metrics(self.run_id, step, metrics)
+        self._last_step = step
+
+    def on_train_end(self, trainer):
+        for name in ("best", "last"):
+            path = getattr(trainer, name, None)
+            if path and os.path.exists(path):
+                self.store.log_artifact(self.run_id, f"{name}.pt", path)
+
+        results_csv = os.path.join(trainer.save_dir, "results.csv")
+        if os.path.exists(results_csv):
+            self.store.log_artifact(self.run_id, "results.csv", results_csv)
+
+        self.store.log_event(self.run_id, "finished")
+        self.store.flush()
+
+    def register(self, model):
+        """Attach the callbacks to an ultralytics YOLO model."""
+        model.add_callback("on_train_start", self.on_train_start)
+        model.add_callback("on_fit_epoch_end", self.on_fit_epoch_end)
+        model.add_callback("on_train_end", self.on_train_end)
+
+
+def import_run_dir(store, run_dir, project=None, force=False):
+    """
+    Import an existing ultralytics run folder (args.yaml + results.csv) into the store.
+
+    The folder is recorded as a `source_dir` artifact; importing it again
+    raises ValueError unless `force` is set. Returns the new run id.
+    """
+    existing = store.find_imported(run_dir)
+    if existing is not None and not force:
+        raise ValueError(f"{run_dir} was already imported as run {existing}")
+
+    with open(os.path.join(run_dir, "args.yaml"), "r") as f:
+        args = yaml.safe_load(f) or {}
+
+    run_id = store.start_run(
+        project or args.get("project", ""), args.get("name", os.path.basename(run_dir)), args
+    )
+
+    with open(os.path.join(run_dir, "results.csv"), "r", newline="") as f:
+        for row in csv.DictReader(f):
+            row = {k.strip(): v for k, v in row.items()}
+            step = int(float(row.pop("epoch")))
+            row.pop("time", None)
+            store.log_metrics(run_id, step, {k: float(v) for k, v in row.items() if v != ""})
+
+    store.log_artifact(run_id, "source_dir", run_dir)
+    store.log_artifact(run_id, "results.csv", os.path.join(run_dir, "results.csv"))
+    for name in ("best.pt", "last.pt"):
+        weights = os.path.join(run_dir, "weights", name)
+        if os.path.exists(weights):
+            store.log_artifact(run_id, name, weights)
+
+    store.log_event(run_id, "finished")
+    store.flush()
+    return run_id
+
+
+def sync_to_wandb(store, run_id, project=None):
+    """Replay a stored run into Weights & Biases (requires the optional `wandb` package)."""
+    import wandb  # pylint: disable=import-outside-toplevel
+
+    run = next(r for r in store.runs() if r["id"] == run_id)
+
+    wb_run = wandb.init(
+        project=project or run["project"],
+        name=run["name"],
+        config=store.params(run_id),
+        reinit=True,
+    )
+
+    steps = {}
+    for key in store.metric_keys(run_id):
+        for step, value in store.series(run_id, key):
+            steps.setdefault(step, {})[key] = value
+    for step in sorted(steps):
+        wb_run.log(steps[step], step=step)
+
+    for name, path in store.artifacts(run_id):
+        # Directory references (source_dir) are bookkeeping, not uploadable files
+        if os.path.isfile(path):
+            artifact = wandb.Artifact(f"{run['name']}-{name}".replace("/", "-"), type="run-file")
+            artifact.add_file(path, name=name)
+            wb_run.log_artifact(artifact)
+
+    wb_run.finish()
+    store.log_event(run_id, "synced")
+    store.flush()
@@ -0,0 +1,103 @@
+import numpy as np
+
+
+def box_iou(boxes_a, boxes_b):
+    """Pairwise IoU between two sets of xyxy boxes, shape (len(a), len(b))."""
+    boxes_a = np.asarray(boxes_a, dtype=np.float32).reshape(-1, 4)
+    boxes_b = np.asarray(boxes_b, dtype=np.float32).reshape(-1, 4)
+
+    top_left = np.maximum(boxes_a[:, None, :2], boxes_b[None, :, :2])
+    bottom_right = np.minimum(boxes_a[:, None, 2:], boxes_b[None, :, 2:])
+    inter = np.clip(bottom_right - top_left, 0, None).prod(axis=2)
+
+    area_a = (boxes_a[:, 2] - boxes_a[:, 0]) * (boxes_a[:, 3] - boxes_a[:, 1])
+    area_b = (boxes_b[:, 2] - boxes_b[:, 0]) * (boxes_b[:, 3] - boxes_b[:, 1])
+    union = area_a[:, None] + area_b[None, :] - inter
+
+    return inter / np.maximum(union, 1e-9)
+
+
+def flip_boxes_lr(boxes, width):
+    """Map xyxy boxes predicted on a horizontally flipped frame back to the original."""
+    boxes = np.asarray(boxes, dtype=np.float32).reshape(-1, 4).copy()
+    boxes[:, [0, 2]] = width - boxes[:, [2, 0]]
+    return boxes
+
+
+def max_confidence_score(confs):
+    """Uncertainty from the most confident detection: 1 - max(conf), 1.0 if nothing found."""
+    confs = np.asarray(confs, dtype=np.float32)
+    if confs.size == 0:
+        return 1.0
+    return float(1.0 - confs.max())
+
+
+def class_margin_score(boxes, confs, classes, pair=(0, 1), iou_thr=0.5):
+    """
+    Uncertainty between two easily confused classes (light_blue vs dark_blue).
+
+    NMS runs per class, so the same cap can survive as both classes. For every
+    box of one class in `pair`, the margin is |conf - conf of the
+    highest-IoU box of the other class above `iou_thr`| (or its own conf when
+    unmatched).
+    Returns 1 - smallest margin, 0.0 if no box of either class is present.
+    """
+    boxes = np.asarray(boxes, dtype=np.float32).reshape(-1, 4)
+    confs = np.asarray(confs, dtype=np.float32)
+    classes = np.asarray(classes).astype(int)
+
+    mask_a = classes == pair[0]
+    mask_b = classes == pair[1]
+    if not mask_a.any() and not mask_b.any():
+        return 0.0
+
+    margins = np.concatenate([confs[mask_a], confs[mask_b]])
+    if mask_a.any() and mask_b.any():
+        conf_a, conf_b = confs[mask_a], confs[mask_b]
+        iou = box_iou(boxes[mask_a], boxes[mask_b])
+        matched = iou >= iou_thr
+        # Best overlapping box of the other class = highest IoU among matches
+        scored = np.where(matched, iou, -1.0)
+        best_b = scored.argmax(axis=1)
+        best_a = scored.argmax(axis=0)
+
+        # Replace own-conf margins with the pairwise margin where a match exists
+        margin_a = np.where(matched.any(axis=1), np.abs(conf_a - conf_b[best_b]), conf_a)
+        margin_b = np.where(matched.any(axis=0), np.abs(conf_b - conf_a[best_a]), conf_b)
+        margins = np.concatenate([margin_a, margin_b])
+
+    return float(1.0 - margins.min())
+
+
+def tta_disagreement_score(boxes_a, classes_a, boxes_b, classes_b, iou_thr=0.5):
+    """
+    Disagreement between two predictions of the same frame (e.g. original vs flipped).
+
+    Boxes are greedily matched by IoU; a box counts as agreeing only if it has
+    a match of the same class. Returns the fraction of disagreeing boxes over
+    both predictions, 0.0 when both are empty.
+    """
+    boxes_a = np.asarray(boxes_a, dtype=np.float32).reshape(-1, 4)
+    boxes_b = np.asarray(boxes_b, dtype=np.float32).reshape(-1, 4)
+    classes_a = np.asarray(classes_a).astype(int)
+    classes_b = np.asarray(classes_b).astype(int)
+
+    total = len(boxes_a) + len(boxes_b)
+    if total == 0:
+        return 0.0
+    if len(boxes_a) == 0 or len(boxes_b) == 0:
+        return 1.0
+
+    iou = box_iou(boxes_a, boxes_b)
+    iou[classes_a[:, None] != classes_b[None, :]] = 0.0
+
+    agreed = 0
+    while True:
+        i, j = np.unravel_index(iou.argmax(), iou.shape)
+        if iou[i, j] < iou_thr:
+            break
+        agreed += 1
+        iou[i, :] = 0.0
+        iou[:, j] = 0.0
+
+    return float((total - 2 * agreed) / total)
@@ -0,0 +1,276 @@
+import contextlib
+import json
+import multiprocessing as mp
+import os
+import queue as queue_mod
+import resource
+import shutil
+import sys
+import time
+
+from scripts.relabel import LabelRelabeler
+from scripts.split_dataset import DatasetSplitter
+
+COLOR_MAP = {
+    "b2": 2,   # green → other
+    "b3": 2,   # orange → other
+    "b4": 0,   # light blue
+    "b5": 1,   # dark blue
+}
+
+STEPS = ("relabel", "categorize", "split")
+
+
+def _proc_status_mb(field):
+    """Read a memory field (VmRSS, VmHWM) from /proc/self/status in MB, None if unavailable."""
+    try:
+        with open("/proc/self/status", "r") as f:
+            for line in f:
+                if line.startswith(field + ":"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return None
+
+
+def _reset_peak_rss():
+    """
+    Reset the kernel's peak-RSS counter (Linux >= 4.0). Returns True on success.
+
+    A spawned child keeps the peak of the forked parent across exec, so without
+    a reset ru_maxrss reports the parent's size, not the step's.
+    """
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+    except OSError:
+        return False
+    return _proc_status_mb("VmHWM") is not None
+
+
+def _peak_rss_mb():
+    """Peak resident set size of the current process in MB."""
+    hwm = _proc_status_mb("VmHWM")
+    if hwm is not None:
+        return hwm
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KB, macOS reports bytes
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def _current_rss_mb():
+    """Current resident set size in MB (falls back to the peak where /proc is missing)."""
+    rss = _proc_status_mb("VmRSS")
+    return rss if rss is not None else _peak_rss_mb()
+
+
+def _splitter(img_dir, lbl_dir, out_dir):
+    return DatasetSplitter(
+        img_dir=img_dir,
+        lbl_dir=lbl_dir,
+        out_img_train=os.path.join(out_dir, "images/train"),
+        out_img_val=os.path.join(out_dir, "images/val"),
+        out_lbl_train=os.path.join(out_dir, "labels/train"),
+        out_lbl_val=os.path.join(out_dir, "labels/val"),
+    )
+
+
+def _run_step(step, img_dir, lbl_dir, out_dir, queue):
+    """Child-process entry point: run one step and report wall time and peak RSS."""
+    try:
+        with open(os.devnull, "w") as devnull, \
+                contextlib.redirect_stdout(devnull), contextlib.redirect_stderr(devnull):
+            rss_before = _current_rss_mb()
+            _reset_peak_rss()
+            start = time.perf_counter()
+
+            if step == "relabel":
+                LabelRelabeler(lbl_dir, os.path.join(out_dir, "relabels"), COLOR_MAP).run()
+            elif step == "categorize":
+                _splitter(img_dir, lbl_dir, out_dir).categorize_files()
+            elif step == "split":
+                _splitter(img_dir, lbl_dir, out_dir).run()
+            else:
+                raise ValueError(f"Unknown step: {step}")
+
+            wall = time.perf_counter() - start
+    except Exception as exc:  # pylint: disable=broad-except
+        queue.put({"error": repr(exc)})
+        return
+
+    peak = _peak_rss_mb()
+    queue.put({"wall_s": wall, "peak_rss_mb": peak, "step_rss_mb": max(peak - rss_before, 0.0)})
+
+
+class DataPrepBenchmark:
+    """
+    Benchmark the data-prep scripts on synthetic datasets of increasing size.
+
+    Each step runs in a fresh spawned process so its peak RSS is not polluted
+    by earlier steps. `step_rss_mb` is the peak RSS during the step minus the
+    RSS just before it, i.e. without interpreter and import overhead. Results can be
+    compared against a saved baseline and checked for super-linear scaling
+    between the smallest and largest size.
+    """
+
+    # Child-process entry point; must be a picklable module-level function
+    step_target = staticmethod(_run_step)
+
+    def __init__(self, work_dir, sizes=(1000, 4000), steps=STEPS, seed=0,
+                 threshold=0.25, scaling_limit=2.5, min_rss_delta_mb=1.0):
+        self.work_dir = work_dir
+        self.sizes = sorted(sizes)
+        self.steps = steps
+        self.seed = seed
+        self.threshold = threshold
+        self.scaling_limit = scaling_limit
+        self.min_rss_delta_mb = min_rss_delta_mb
+
+        self.results = []
+
+    def prepare(self, size):
+        """Generate (or reuse) the synthetic dataset for a given size."""
+        # Imported here so spawned step processes don't load cv2/numpy
+        from scripts.generate_dataset import SyntheticDatasetGenerator  # pylint: disable=import-outside-toplevel
+
+        data_dir = os.path.join(self.work_dir, f"data_{size}")
+        generator = SyntheticDatasetGenerator(data_dir, size, seed=self.seed)
+
+        # Written only after generation finishes, so an interrupted run is regenerated
+        marker_path = os.path.join(data_dir, ".complete.json")
+        marker = {"size": size, "seed": self.seed, "images": generator.images}
+
+        try:
+            with open(marker_path, "r") as f:
+                complete = json.load(f) == marker
+        except (OSError, ValueError):
+            complete = False
+
+        if not complete:
+            if os.path.exists(data_dir):
+                shutil.rmtree(data_dir)
+            with open(os.devnull, "w") as devnull, contextlib.redirect_stderr(devnull):
+                generator.run()
+            with open(marker_path, "w") as f:
+                json.dump(marker, f)
+
+        return generator.img_dir, generator.lbl_dir
+
+    def run_step(self, step, size):
+        """Run one step on the dataset of `size` files and return its result record."""
+        img_dir, lbl_dir = self.prepare(size)
+        out_dir = os.path.join(self.work_dir, f"out_{step}_{size}")
+
+        ctx = mp.get_context("spawn")
+        queue = ctx.Queue()
+        proc = ctx.Process(target=self.step_target, args=(step, img_dir, lbl_dir, out_dir, queue))
+        proc.start()
+
+        # Poll so a child killed before reporting (e.g. by the OOM killer) can't hang us
+        stats = None
+        while stats is None:
+            try:
+                stats = queue.get(timeout=0.5)
+            except queue_mod.Empty:
+                if not proc.is_alive():
+                    try:
+                        stats = queue.get(timeout=0.5)
+                    except queue_mod.Empty:
+                        break
+        proc.join()
+
+        if stats is None:
+            raise RuntimeError(
+                f"Benchmark step {step} ({size} files) died without reporting "
+                f"(exit code {proc.exitcode})"
+            )
+        if "error" in stats:
+            raise RuntimeError(f"Benchmark step {step} ({size} files) failed: {stats['error']}")
+
+        return {
+            "step": step,
+            "size": size,
+            "wall_s": round(stats["wall_s"], 4),
+            "files_per_s": round(size / max(stats["wall_s"], 1e-9), 1),
+            "peak_rss_mb": round(stats["peak_rss_mb"], 1),
+            "step_rss_mb": round(stats["step_rss_mb"], 1),
+        }
+
+    def run(self):
+        """Run every step at every size."""
+        self.results = [self.run_step(step, size) for size in self.sizes for step in self.steps]
+        return self.results
+
+    def save(self, path):
+        """Write results as JSON (usable later as a baseline)."""
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with open(path, "w") as f:
+            json.dump(self.results, f, indent=2)
+
+    def compare(self, baseline_path):
+        """Return regression messages for results slower or heavier than the baseline."""
+        with open(baseline_path, "r") as f:
+            baseline = {(r["step"], r["size"]): r for r in json.load(f)}
+
+        regressions = []
+        for res in self.results:
+            base = baseline.get((res["step"], res["size"]))
+            if base is None:
+                continue
+
+            for metric in ("wall_s", "step_rss_mb"):
+                if metric not in base:
+                    continue
+                limit = base[metric] * (1 + self.threshold)
+                if metric == "step_rss_mb":
+                    # Small deltas are dominated by allocator noise
+                    limit = max(limit, base[metric] + self.min_rss_delta_mb)
+                if res[metric] > limit:
+                    regressions.append(
+                        f"{res['step']} @ {res['size']} files: {metric} {res[metric]} "
+                        f"> baseline {base[metric]} (+{self.threshold:.0%})"
+                    )
+        return regressions
+
+    def check_scaling(self):
+        """Return messages for steps whose time per file grows super-linearly with size."""
+        small, large = self.sizes[0], self.sizes[-1]
+        if large < 4 * small:
+            return []
+
+        by_key = {(r["step"], r["size"]): r for r in self.results}
+        messages = []
+        for step in self.steps:
+            # Too fast at the largest size for timer noise to be meaningful
+            if by_key[(step, large)]["wall_s"] < 0.05:
+                continue
+
+            per_file_small = by_key[(step, small)]["wall_s"] / small
+            per_file_large = by_key[(step, large)]["wall_s"] / large
+            ratio = per_file_large / max(per_file_small, 1e-12)
+
+            if ratio > self.scaling_limit:
+                messages.append(
+                    f"{step}: time per file grew {ratio:.2f}x from {small} to {large} files "
+                    f"(limit {self.scaling_limit}x)"
+                )
+        return messages
+
+    def report(self):
+        """Print a results table."""
+        print(f"{'step':<12}{'size':>10}{'wall_s':>10}{'files/s':>12}"
+              f"{'peak_rss_mb':>14}{'step_rss_mb':>14}")
+        for r in self.results:
+            print(f"{r['step']:<12}{r['size']:>10}{r['wall_s']:>10}"
+                  f"{r['files_per_s']:>12}{r['peak_rss_mb']:>14}{r['step_rss_mb']:>14}")
+
+
+if __name__ == "__main__":
+    bench = DataPrepBenchmark(
+        work_dir="data/bench",
+        sizes=(1_000, 10_000, 100_000, 1_000_000),
+    )
+
+    bench.run()
+    bench.report()
+    bench.save("data/bench/results.json")
@@ -0,0 +1,96 @@
+import os
+import random
+
+import cv2
+import numpy as np
+from tqdm import tqdm
+
+
+class SyntheticDatasetGenerator:
+    """
+    Generate a deterministic bottle-cap dataset for tests and benchmarks.
+
+    Produces `_bN_`-coded YOLO label files with a variable number of boxes and,
+    optionally, matching small JPEGs. The same seed always yields the same files.
+    """
+
+    # BGR fill colour per b-code, only used for the optional JPEGs
+    COLORS = {
+        "b2": (60, 180, 60),     # green
+        "b3": (40, 140, 240),    # orange
+        "b4": (230, 200, 120),   # light blue
+        "b5": (140, 40, 20),     # dark blue
+    }
+
+    def __init__(self, out_dir, n_files, seed=0, codes=("b2", "b3", "b4", "b5"),
+                 max_boxes=8, images=True, img_size=32):
+        self.out_dir = out_dir
+        self.n_files = n_files
+        self.seed = seed
+        self.codes = codes
+        self.max_boxes = max_boxes
+        self.images = images
+        self.img_size = img_size
+
+        self.img_dir = os.path.join(out_dir, "images_raw")
+        self.lbl_dir = os.path.join(out_dir, "labels_raw")
+
+    def filename(self, index, code):
+        """Build a `_bN_`-coded file stem, e.g. cap_b4_0000042."""
+        return f"cap_{code}_{index:07d}"
+
+    def label_lines(self, rng):
+        """Random YOLO label lines (class x y w h), 1..max_boxes boxes."""
+        lines = []
+        for _ in range(rng.randint(1, self.max_boxes)):
+            w = rng.uniform(0.02, 0.2)
+            h = rng.uniform(0.02, 0.2)
+            x = rng.uniform(w / 2, 1 - w / 2)
+            y = rng.uniform(h / 2, 1 - h / 2)
+            lines.append(f"{rng.randint(0, 2)} {x:.6f} {y:.6f} {w:.6f} {h:.6f}\n")
+        return lines
+
+    def encode_images(self):
+        """Encode one small JPEG per b-code; every image of that code reuses the bytes."""
+        encoded = {}
+        for code in self.codes:
+            color = self.COLORS.get(code, (128, 128, 128))
+            img = np.full((self.img_size, self.img_size, 3), color, dtype=np.uint8)
+            ok, buf = cv2.imencode(".jpg", img)
+            if not ok:
+                raise RuntimeError(f"Failed to encode JPEG for {code}")
+            encoded[code] = buf.tobytes()
+        return encoded
+
+    def run(self):
+        """Write the dataset and return the (img_dir, lbl_dir) pair."""
+        os.makedirs(self.lbl_dir, exist_ok=True)
+        if self.images:
+            os.makedirs(self.img_dir, exist_ok=True)
+            jpegs = self.encode_images()
+
+        rng = random.Random(self.seed)
+
+        for i in tqdm(range(self.n_files), desc="Generating", unit="file"):
+            code = self.codes[i % len(self.codes)]
+            stem = self.filename(i, code)
+
+            with open(os.path.join(self.lbl_dir, stem + ".txt"), "w") as f:
+                f.writelines(self.label_lines(rng))
+
+            if self.images:
+                with open(os.path.join(self.img_dir, stem + ".jpg"), "wb") as f:
+                    f.write(jpegs[code])
+
+        return self.img_dir, self.lbl_dir
+
+
+if __name__ == "__main__":
+    generator = SyntheticDatasetGenerator(
+        out_dir="../data/synthetic",
+        n_files=10_000,
+    )
+
+    img_dir, lbl_dir = generator.run()
+    print(f"Synthetic images : {os.path.abspath(img_dir)}")
+    print(f"Synthetic labels : {os.path.abspath(lbl_dir)}")
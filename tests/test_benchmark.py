@@ -0,0 +1,174 @@
+import json
+import os
+import pytest
+from scripts.benchmark import DataPrepBenchmark
+
+# Benchmarks are slow and timing-sensitive, so they only run on request:
+#   BSORT_BENCH=1 pytest tests/test_benchmark.py -s
+# Optional settings:
+#   BSORT_BENCH_SIZES=1000,10000,100000   dataset sizes (files)
+#   BSORT_BENCH_BASELINE=path.json        fail on regression against this file
+#   BSORT_BENCH_THRESHOLD=0.25            allowed slowdown / RSS growth
+#   BSORT_BENCH_OUT=path.json             where to save this run's results
+requires_bench = pytest.mark.skipif(
+    not os.environ.get("BSORT_BENCH"),
+    reason="set BSORT_BENCH=1 to run data-prep benchmarks",
+)
+
+
+# Spawned child that dies without reporting, like an OOM kill
+def die_without_report(step, img_dir, lbl_dir, out_dir, queue):
+    os._exit(137)
+
+
+class DyingBenchmark(DataPrepBenchmark):
+    step_target = staticmethod(die_without_report)
+
+
+# Helper: a benchmark holding made-up results, nothing is executed
+def fake_bench(results, sizes=(1000, 4000), steps=("relabel",), **kwargs):
+    bench = DataPrepBenchmark("unused", sizes=sizes, steps=steps, **kwargs)
+    bench.results = [
+        {"step": step, "size": size, "wall_s": wall, "files_per_s": size / wall,
+         "peak_rss_mb": 60.0 + rss, "step_rss_mb": rss}
+        for step, size, wall, rss in results
+    ]
+    return bench
+
+
+# Helper: write a baseline JSON in the format produced by save()
+def write_baseline(tmp_path, bench):
+    path = tmp_path / "baseline.json"
+    path.write_text(json.dumps(bench.results))
+    return str(path)
+
+
+@pytest.fixture(scope="module")
+def bench(tmp_path_factory):
+    sizes = [int(s) for s in os.environ.get("BSORT_BENCH_SIZES", "1000,4000").split(",")]
+    threshold = float(os.environ.get("BSORT_BENCH_THRESHOLD", "0.25"))
+
+    bench = DataPrepBenchmark(
+        work_dir=str(tmp_path_factory.mktemp("bench")),
+        sizes=sizes,
+        threshold=threshold,
+    )
+    bench.run()
+    bench.report()
+
+    out = os.environ.get("BSORT_BENCH_OUT")
+    if out:
+        bench.save(out)
+    return bench
+
+
+# TEST 1 — compare(): results equal to the baseline pass
+def test_compare_no_regression(tmp_path):
+    baseline = write_baseline(tmp_path, fake_bench([("relabel", 1000, 0.1, 5.0)]))
+    bench = fake_bench([("relabel", 1000, 0.11, 5.5)])
+
+    assert bench.compare(baseline) == []
+
+
+# TEST 2 — compare(): slower and heavier steps are flagged
+def test_compare_flags_regressions(tmp_path):
+    baseline = write_baseline(tmp_path, fake_bench([("relabel", 1000, 0.1, 10.0)]))
+    bench = fake_bench([("relabel", 1000, 0.2, 20.0)])
+
+    messages = bench.compare(baseline)
+
+    assert len(messages) == 2
+    assert any("wall_s" in m for m in messages)
+    assert any("step_rss_mb" in m for m in messages)
+
+
+# TEST 3 — compare(): tiny RSS deltas are within the absolute floor
+def test_compare_rss_floor(tmp_path):
+    baseline = write_baseline(tmp_path, fake_bench([("relabel", 1000, 0.1, 0.2)]))
+    bench = fake_bench([("relabel", 1000, 0.1, 0.9)])
+
+    assert bench.compare(baseline) == []
+
+
+# TEST 4 — check_scaling(): linear growth passes, quadratic growth is flagged
+def test_check_scaling():
+    linear = fake_bench([("relabel", 1000, 0.1, 1.0), ("relabel", 4000, 0.4, 1.0)])
+    quadratic = fake_bench([("relabel", 1000, 0.1, 1.0), ("relabel", 4000, 1.6, 1.0)])
+
+    assert linear.check_scaling() == []
+    assert "relabel" in quadratic.check_scaling()[0]
+
+
+# TEST 5 — check_scaling(): skipped when sizes are too close or runs too short
+def test_check_scaling_skips():
+    close = fake_bench([("relabel", 1000, 0.1, 1.0), ("relabel", 2000, 1.0, 1.0)],
+                       sizes=(1000, 2000))
+    fast = fake_bench([("relabel", 1000, 0.001, 1.0), ("relabel", 4000, 0.04, 1.0)])
+
+    assert close.check_scaling() == []
+    assert fast.check_scaling() == []
+
+
+# TEST 6 — run_step(): a child that dies without reporting raises instead of hanging
+def test_run_step_child_killed(tmp_path):
+    bench = DyingBenchmark(str(tmp_path), sizes=(5,))
+
+    with pytest.raises(RuntimeError, match=r"relabel \(5 files\).*exit code 137"):
+        bench.run_step("relabel", 5)
+
+
+# TEST 7 — prepare(): a partial dataset without completion marker is regenerated
+def test_prepare_regenerates_partial(tmp_path):
+    bench = DataPrepBenchmark(str(tmp_path), sizes=(10,))
+    partial = tmp_path / "data_10" / "labels_raw"
+    partial.mkdir(parents=True)
+    (partial / "cap_b2_0000000.txt").write_text("0 0.5 0.5 0.1 0.1\n")
+
+    img_dir, lbl_dir = bench.prepare(10)
+
+    assert len(os.listdir(lbl_dir)) == 10
+    assert len(os.listdir(img_dir)) == 10
+
+
+# TEST 8 — prepare(): complete datasets are reused, mismatched markers are not
+def test_prepare_marker(tmp_path):
+    bench = DataPrepBenchmark(str(tmp_path), sizes=(10,))
+    _, lbl_dir = bench.prepare(10)
+    extra = os.path.join(lbl_dir, "extra.txt")
+    open(extra, "w").close()
+
+    bench.prepare(10)
+    assert os.path.exists(extra)
+
+    reseeded = DataPrepBenchmark(str(tmp_path), sizes=(10,), seed=1)
+    reseeded.prepare(10)
+    assert not os.path.exists(extra)
+
+
+# TEST 9 — every step reports time, throughput and memory
+@requires_bench
+def test_bench_results_recorded(bench):
+    assert len(bench.results) == len(bench.sizes) * len(bench.steps)
+    for res in bench.results:
+        assert res["wall_s"] > 0
+        assert res["files_per_s"] > 0
+        assert res["peak_rss_mb"] > 0
+        assert res["step_rss_mb"] >= 0
+
+
+# TEST 10 — time per file must not grow super-linearly with dataset size
+@requires_bench
+def test_bench_linear_scaling(bench):
+    messages = bench.check_scaling()
+    assert not messages, "\n".join(messages)
+
+
+# TEST 11 — no regression against a saved baseline
+@requires_bench
+def test_bench_against_baseline(bench):
+    baseline = os.environ.get("BSORT_BENCH_BASELINE")
+    if not baseline:
+        pytest.skip("BSORT_BENCH_BASELINE not set")
+
+    regressions = bench.compare(baseline)
+    assert not regressions, "\n".join(regressions)
@@ -0,0 +1,62 @@
+import os
+from pathlib import Path
+import pytest
+from scripts.generate_dataset import SyntheticDatasetGenerator
+from scripts.relabel import LabelRelabeler
+from scripts.split_dataset import DatasetSplitter
+
+
+# TEST 1 — run(): expected number of image/label files
+def test_generate_counts(tmp_path):
+    generator = SyntheticDatasetGenerator(str(tmp_path / "data"), n_files=20)
+    img_dir, lbl_dir = generator.run()
+
+    assert len(os.listdir(img_dir)) == 20
+    assert len(os.listdir(lbl_dir)) == 20
+
+
+# TEST 2 — same seed produces identical datasets
+def test_generate_deterministic(tmp_path):
+    _, lbl_a = SyntheticDatasetGenerator(str(tmp_path / "a"), n_files=10, seed=7).run()
+    _, lbl_b = SyntheticDatasetGenerator(str(tmp_path / "b"), n_files=10, seed=7).run()
+
+    for fname in sorted(os.listdir(lbl_a)):
+        assert Path(lbl_a, fname).read_text() == Path(lbl_b, fname).read_text()
+
+
+# TEST 3 — labels are valid YOLO lines with a variable box count
+def test_generate_label_format(tmp_path):
+    generator = SyntheticDatasetGenerator(str(tmp_path / "data"), n_files=50, max_boxes=5,
+                                          images=False)
+    _, lbl_dir = generator.run()
+
+    counts = set()
+    for fname in os.listdir(lbl_dir):
+        lines = Path(lbl_dir, fname).read_text().splitlines()
+        counts.add(len(lines))
+
+        for line in lines:
+            parts = line.split()
+            assert len(parts) == 5
+            assert parts[0] in {"0", "1", "2"}
+            assert all(0.0 <= float(v) <= 1.0 for v in parts[1:])
+
+    assert counts <= set(range(1, 6))
+    assert len(counts) > 1
+    assert not os.path.exists(generator.img_dir)
+
+
+# TEST 4 — filenames carry a b-code understood by the data-prep scripts
+def test_generate_bcodes(tmp_path):
+    img_dir, lbl_dir = SyntheticDatasetGenerator(str(tmp_path / "data"), n_files=8).run()
+
+    relabeler = LabelRelabeler(lbl_dir, str(tmp_path / "out"), {})
+    assert all(relabeler.extract_code(f) in {"b2", "b3", "b4", "b5"} for f in os.listdir(lbl_dir))
+
+    splitter = DatasetSplitter(
+        img_dir=img_dir, lbl_dir=lbl_dir,
+        out_img_train="unused", out_img_val="unused",
+        out_lbl_train="unused", out_lbl_val="unused"
+    )
+    splitter.categorize_files()
+    assert all(len(v) == 2 for v in splitter.buckets.values())
@@ -0,0 +1,113 @@
+import csv
+import json
+import os
+import pytest
+from bsort.mine import ActiveLearningMiner
+
+
+# Helper: create a pool of dummy image files (contents are never decoded here)
+def create_pool(tmp_path, names):
+    pool = tmp_path / "pool"
+    pool.mkdir()
+    for name in names:
+        (pool / name).write_bytes(b"img")
+    return pool
+
+
+# Helper: write raw lines into the miner's checkpoint
+def write_scores(miner, lines):
+    with open(miner.scores_path, "w") as f:
+        f.writelines(lines)
+
+
+def record(path, score):
+    return json.dumps({
+        "image": str(path), "score": score, "max_conf_score": score,
+        "margin_score": 0.0, "tta_score": 0.0, "detections": 1,
+    }) + "\n"
+
+
+# TEST 1 — iter_batches(): scored images are skipped, however the pool path is spelled
+def test_resume_skips_scored_images(tmp_path, monkeypatch):
+    pool = create_pool(tmp_path, [f"img{i}.jpg" for i in range(5)])
+    monkeypatch.chdir(tmp_path)
+
+    first = ActiveLearningMiner("unused.pt", "pool", str(tmp_path / "out"), batch=2)
+    write_scores(first, [record(p, 0.5) for p in list(first.iter_pool())[:3]])
+
+    rerun = ActiveLearningMiner("unused.pt", "./pool", str(tmp_path / "out"), batch=2)
+    pending = [p for batch in rerun.iter_batches(rerun.load_checkpoint()) for p in batch]
+
+    assert pending == [str(pool / "img3.jpg"), str(pool / "img4.jpg")]
+
+
+# TEST 2 — iter_batches(): batches have at most `batch` images
+def test_iter_batches_sizes(tmp_path):
+    pool = create_pool(tmp_path, [f"img{i}.jpg" for i in range(5)] + ["notes.txt"])
+    miner = ActiveLearningMiner("unused.pt", str(pool), str(tmp_path / "out"), batch=2)
+
+    assert [len(b) for b in miner.iter_batches(set())] == [2, 2, 1]
+
+
+# TEST 3 — repair_checkpoint(): a torn last line does not swallow the next record
+def test_torn_line_repaired(tmp_path):
+    pool = create_pool(tmp_path, ["img1.jpg", "img4.jpg"])
+    miner = ActiveLearningMiner("unused.pt", str(pool), str(tmp_path / "out"))
+    write_scores(miner, [record(pool / "img1.jpg", 0.3), '{"image": "img2.jpg", "sco'])
+
+    miner.repair_checkpoint()
+    with open(miner.scores_path, "a") as f:
+        f.write(record(pool / "img4.jpg", 0.9))
+
+    assert miner.load_checkpoint() == {str(pool / "img1.jpg"), str(pool / "img4.jpg")}
+    assert [r["image"] for r in miner.write_shortlist()] == [
+        str(pool / "img4.jpg"), str(pool / "img1.jpg")
+    ]
+
+
+# TEST 4 — repair_checkpoint(): intact checkpoint is left untouched
+def test_repair_keeps_complete_file(tmp_path):
+    miner = ActiveLearningMiner("unused.pt", "pool", str(tmp_path / "out"))
+    lines = [record("a.jpg", 0.1), record("b.jpg", 0.2)]
+    write_scores(miner, lines)
+
+    miner.repair_checkpoint()
+
+    with open(miner.scores_path) as f:
+        assert f.readlines() == lines
+
+
+# TEST 5 — write_shortlist(): top_k ordering, unreadable images excluded
+def test_shortlist_top_k(tmp_path):
+    miner = ActiveLearningMiner("unused.pt", "pool", str(tmp_path / "out"), top_k=2)
+    write_scores(miner, [
+        record("/pool/a.jpg", 0.2),
+        record("/pool/b.jpg", 0.9),
+        json.dumps({"image": "/pool/c.jpg", "error": "unreadable"}) + "\n",
+        record("/pool/d.jpg", 0.5),
+    ])
+
+    top = miner.write_shortlist()
+
+    assert [r["image"] for r in top] == ["/pool/b.jpg", "/pool/d.jpg"]
+    with open(miner.shortlist_path, newline="") as f:
+        rows = list(csv.DictReader(f))
+    assert [(r["rank"], r["image"]) for r in rows] == [("1", "/pool/b.jpg"), ("2", "/pool/d.jpg")]
+
+
+# TEST 6 — write_shortlist(): the same image scored twice is listed once
+def test_shortlist_deduplicates(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    miner = ActiveLearningMiner("unused.pt", "pool", str(tmp_path / "out"))
+    write_scores(miner, [
+        record("pool/a.jpg", 0.8),
+        record(tmp_path / "pool" / "a.jpg", 0.7),
+        record("pool/b.jpg", 0.4),
+    ])
+
+    top = miner.write_shortlist()
+
+    assert [(r["image"], r["score"]) for r in top] == [
+        (str(tmp_path / "pool" / "a.jpg"), 0.7),
+        (str(tmp_path / "pool" / "b.jpg"), 0.4),
+    ]
@@ -0,0 +1,121 @@
+import threading
+import numpy as np
+import cv2
+import pytest
+from bsort.render import AsyncRenderer, draw_boxes, encode_jpeg
+
+
+# TEST 1 — draw_boxes(): outline drawn, interior untouched
+def test_draw_boxes_outline():
+    frame = np.zeros((50, 50, 3), dtype=np.uint8)
+
+    draw_boxes(frame, [[10, 10, 30, 30]], [0], thickness=1)
+
+    assert frame[10, 20].any()   # top edge
+    assert frame[30, 20].any()   # bottom edge
+    assert frame[20, 10].any()   # left edge
+    assert frame[20, 30].any()   # right edge
+    assert not frame[20, 20].any()  # interior
+    assert not frame[5, 5].any()    # outside
+
+
+# TEST 2 — draw_boxes(): matches cv2.rectangle for several boxes
+def test_draw_boxes_matches_cv2():
+    boxes = [[2, 3, 20, 15], [25, 25, 45, 40], [0, 0, 49, 49]]
+    classes = [0, 1, 2]
+
+    ours = draw_boxes(np.zeros((50, 50, 3), dtype=np.uint8), boxes, classes, thickness=1)
+
+    ref = np.zeros((50, 50, 3), dtype=np.uint8)
+    for (x1, y1, x2, y2), cls in zip(boxes, classes):
+        color = tuple(int(c) for c in ours[y1, x2])
+        cv2.rectangle(ref, (x1, y1), (x2, y2), color, 1)
+
+    assert np.array_equal(ours.any(axis=2), ref.any(axis=2))
+
+
+# TEST 3 — draw_boxes(): out-of-frame boxes are clipped, no detections is a no-op
+def test_draw_boxes_clip_and_empty():
+    frame = np.zeros((20, 20, 3), dtype=np.uint8)
+
+    draw_boxes(frame, [], [])
+    assert not frame.any()
+
+    draw_boxes(frame, [[-5, -5, 40, 40]], [1])
+    assert frame[0, 10].any()
+    assert frame[19, 10].any()
+
+
+# TEST 4 — encode_jpeg(): valid JPEG, lower quality gives smaller output
+def test_encode_jpeg_quality():
+    rng = np.random.default_rng(0)
+    frame = rng.integers(0, 255, (64, 64, 3), dtype=np.uint8)
+
+    high = encode_jpeg(frame, quality=95, subsampling="444")
+    low = encode_jpeg(frame, quality=30, subsampling="420")
+
+    assert high[:2] == b"\xff\xd8"
+    assert len(low) < len(high)
+    assert cv2.imdecode(np.frombuffer(low, np.uint8), cv2.IMREAD_COLOR).shape == (64, 64, 3)
+
+
+# TEST 5 — AsyncRenderer: writes annotated images in the background
+def test_async_renderer_writes(tmp_path):
+    renderer = AsyncRenderer(str(tmp_path / "pred"), workers=2)
+
+    for i in range(5):
+        frame = np.zeros((32, 32, 3), dtype=np.uint8)
+        assert renderer.submit(frame, [[2, 2, 20, 20]], [0], [0.9], f"img_{i}.png")
+
+    renderer.close()
+
+    assert renderer.rendered == 5
+    assert renderer.dropped == 0
+    assert sorted(p.name for p in (tmp_path / "pred").iterdir()) == [
+        f"img_{i}.jpg" for i in range(5)
+    ]
+
+
+# TEST 6 — AsyncRenderer: full queue drops renders instead of blocking
+def test_async_renderer_drops_when_full(tmp_path):
+    gate = threading.Event()
+
+    class SlowRenderer(AsyncRenderer):
+        def render(self, *args):
+            gate.wait()
+            super().render(*args)
+
+    renderer = SlowRenderer(str(tmp_path / "pred"), workers=1, queue_size=2)
+    frame = np.zeros((16, 16, 3), dtype=np.uint8)
+
+    accepted = [renderer.submit(frame.copy(), [], [], [], f"f{i}.jpg") for i in range(10)]
+    gate.set()
+    renderer.close()
+
+    assert not all(accepted)
+    assert renderer.dropped == accepted.count(False)
+    assert renderer.rendered == accepted.count(True)
+
+
+# TEST 7 — AsyncRenderer: the submitted frame is not modified
+def test_async_renderer_keeps_frame(tmp_path):
+    renderer = AsyncRenderer(str(tmp_path / "pred"), workers=1)
+    frame = np.zeros((32, 32, 3), dtype=np.uint8)
+
+    renderer.submit(frame, [[2, 2, 20, 20]], [0], [0.9], "img.jpg")
+    renderer.close()
+
+    assert renderer.rendered == 1
+    assert not frame.any()
+
+
+# TEST 8 — unknown subsampling values are rejected, also before any rendering
+@pytest.mark.parametrize("subsampling", ["411", "4:2:0", ""])
+def test_unknown_subsampling(tmp_path, subsampling):
+    frame = np.zeros((8, 8, 3), dtype=np.uint8)
+
+    with pytest.raises(ValueError, match="jpeg_subsampling"):
+        encode_jpeg(frame, subsampling=subsampling)
+
+    with pytest.raises(ValueError, match="jpeg_subsampling"):
+        AsyncRenderer(str(tmp_path / "pred"), subsampling=subsampling)
@@ -0,0 +1,281 @@
+import os
+import sqlite3
+import threading
+from types import SimpleNamespace
+import pytest
+from bsort.tracking import MetricsStore, TrainingTracker, import_run_dir
+
+
+# Helper: create a store with a few runs and mAP series
+def create_store(tmp_path, runs):
+    """
+    runs format:
+    {
+        "run-a": ({"model": "yolov8n.pt", "freeze": 5}, [0.1, 0.3, 0.5]),
+        ...
+    }
+    """
+    store = MetricsStore(str(tmp_path / "store.db"), flush_interval=0.05)
+    ids = {}
+    for name, (params, values) in runs.items():
+        run_id = store.start_run("bsort_wandb", name, params)
+        for epoch, value in enumerate(values, start=1):
+            store.log_metrics(run_id, epoch, {"metrics/mAP50-95(B)": value, "train/box_loss": 1 / epoch})
+        ids[name] = run_id
+    store.flush()
+    return store, ids
+
+
+# TEST 1 — writes are buffered and visible after flush()
+def test_log_and_flush(tmp_path):
+    store, ids = create_store(tmp_path, {"run-a": ({"freeze": 5}, [0.1, 0.2, 0.15])})
+
+    assert store.series(ids["run-a"], "metrics/mAP50-95(B)") == [(1, 0.1), (2, 0.2), (3, 0.15)]
+    assert store.params(ids["run-a"]) == {"freeze": 5}
+    assert store.runs()[0]["epochs"] == 3
+    assert store.runs()[0]["status"] == "started"
+    store.close()
+
+
+# TEST 2 — close() commits pending writes and data survives reopening
+def test_persist_after_close(tmp_path):
+    path = str(tmp_path / "store.db")
+    store = MetricsStore(path, flush_interval=10)
+    run_id = store.start_run("p", "run-a")
+    store.log_metrics(run_id, 1, {"metrics/mAP50-95(B)": 0.4})
+    store.log_event(run_id, "finished")
+    store.close()
+
+    reopened = MetricsStore(path)
+    assert reopened.series(run_id, "metrics/mAP50-95(B)") == [(1, 0.4)]
+    assert reopened.runs()[0]["status"] == "finished"
+    reopened.close()
+
+
+# TEST 3 — best_per_run(): max value and the first epoch reaching it
+def test_best_per_run(tmp_path):
+    store, ids = create_store(tmp_path, {
+        "run-a": ({}, [0.1, 0.5, 0.5, 0.3]),
+        "run-b": ({}, [0.2, 0.25]),
+    })
+
+    best = store.best_per_run()
+    assert best[ids["run-a"]] == (0.5, 2)
+    assert best[ids["run-b"]] == (0.25, 2)
+    assert store.best_per_run("train/box_loss", mode="min")[ids["run-a"]] == (0.25, 4)
+    store.close()
+
+
+# TEST 4 — best_per_config(): one row per param combination, best first
+def test_best_per_config(tmp_path):
+    store, _ = create_store(tmp_path, {
+        "freeze5-a": ({"model": "yolov8n.pt", "freeze": 5}, [0.3, 0.4]),
+        "freeze5-b": ({"model": "yolov8n.pt", "freeze": 5}, [0.6, 0.5]),
+        "nofreeze": ({"model": "yolov8n.pt", "freeze": None}, [0.2, 0.45]),
+    })
+
+    rows = store.best_per_config(group_by=("model", "freeze"))
+
+    assert [r["run"] for r in rows] == ["freeze5-b", "nofreeze"]
+    assert rows[0]["best"] == 0.6
+    assert rows[0]["epoch"] == 1
+    assert rows[1]["freeze"] is None
+    store.close()
+
+
+# TEST 5 — epochs_to_plateau(): first epoch within tolerance of the best
+def test_epochs_to_plateau(tmp_path):
+    store, ids = create_store(tmp_path, {"run-a": ({}, [0.1, 0.5, 0.695, 0.7, 0.69])})
+
+    assert store.epochs_to_plateau(ids["run-a"], tolerance=0.01) == 3
+    assert store.epochs_to_plateau(ids["run-a"], tolerance=0.0) == 4
+    assert store.epochs_to_plateau(ids["run-a"], key="missing") is None
+    store.close()
+
+
+# TEST 6 — import_run_dir(): ultralytics args.yaml + results.csv
+def test_import_run_dir(tmp_path):
+    run_dir = tmp_path / "yolov8n-100"
+    run_dir.mkdir()
+    (run_dir / "args.yaml").write_text("model: yolov8n.pt\nepochs: 2\nproject: bsort_wandb\nname: yolov8n-100\n")
+    (run_dir / "results.csv").write_text(
+        "epoch,time,train/box_loss,metrics/mAP50-95(B)\n"
+        "1,1.8,1.5,0.003\n"
+        "2,7.5,1.1,0.009\n"
+    )
+
+    store = MetricsStore(str(tmp_path / "store.db"))
+    run_id = import_run_dir(store, str(run_dir))
+
+    assert store.runs()[0]["name"] == "yolov8n-100"
+    assert store.runs()[0]["status"] == "finished"
+    assert store.params(run_id)["epochs"] == 2
+    assert store.series(run_id, "metrics/mAP50-95(B)") == [(1, 0.003), (2, 0.009)]
+    assert "time" not in store.metric_keys(run_id)
+    store.close()
+
+
+# TEST 7 — TrainingTracker: ultralytics callbacks populate the store
+def test_training_tracker(tmp_path):
+    store = MetricsStore(str(tmp_path / "store.db"), flush_interval=0.05)
+    tracker = TrainingTracker(store, "bsort_wandb", "run-a")
+
+    weights = tmp_path / "best.pt"
+    weights.write_text("w")
+    trainer = SimpleNamespace(
+        args=SimpleNamespace(model="yolov8n.pt", freeze=5),
+        epoch=0,
+        tloss=[1.2],
+        label_loss_items=lambda loss, prefix: {f"{prefix}/box_loss": loss[0]},
+        metrics={"metrics/mAP50-95(B)": 0.42},
+        lr={"lr/pg0": 0.01},
+        best=str(weights),
+        last=str(tmp_path / "missing.pt"),
+        save_dir=str(tmp_path),
+    )
+
+    tracker.on_train_start(trainer)
+    tracker.on_fit_epoch_end(trainer)
+    tracker.on_train_end(trainer)
+
+    run_id = tracker.run_id
+    assert store.params(run_id) == {"model": "yolov8n.pt", "freeze": 5}
+    assert store.metric_keys(run_id) == ["lr/pg0", "metrics/mAP50-95(B)", "train/box_loss"]
+    assert store.artifacts(run_id) == [("best.pt", str(weights))]
+    assert store.runs()[0]["status"] == "finished"
+    store.close()
+
+
+# TEST 8 — epochs_to_plateau(): mode="min" for losses
+def test_epochs_to_plateau_min(tmp_path):
+    store = MetricsStore(str(tmp_path / "store.db"), flush_interval=0.05)
+    run_id = store.start_run("p", "run-a")
+    for epoch, value in enumerate([2.0, 1.0, 0.995, 1.2], start=1):
+        store.log_metrics(run_id, epoch, {"train/box_loss": value})
+    store.flush()
+
+    assert store.epochs_to_plateau(run_id, "train/box_loss", tolerance=0.01, mode="min") == 2
+    assert store.epochs_to_plateau(run_id, "train/box_loss", tolerance=0.0, mode="min") == 3
+    store.close()
+
+
+# TEST 9 — best_per_config(): list-valued params can be grouped
+def test_best_per_config_list_params(tmp_path):
+    store, _ = create_store(tmp_path, {
+        "freeze-list-a": ({"freeze": [0, 1, 2], "imgsz": [640, 480]}, [0.3]),
+        "freeze-list-b": ({"freeze": [0, 1, 2], "imgsz": [640, 480]}, [0.5]),
+        "freeze-5": ({"freeze": 5, "imgsz": 640}, [0.4]),
+    })
+
+    rows = store.best_per_config(group_by=("freeze", "imgsz"))
+
+    assert [r["run"] for r in rows] == ["freeze-list-b", "freeze-5"]
+    assert rows[0]["freeze"] == [0, 1, 2]
+    store.close()
+
+
+# TEST 10 — TrainingTracker: final eval of best.pt does not duplicate the last epoch
+def test_training_tracker_final_eval(tmp_path):
+    store = MetricsStore(str(tmp_path / "store.db"), flush_interval=0.05)
+    tracker = TrainingTracker(store, "bsort_wandb", "run-a")
+    trainer = SimpleNamespace(
+        args=SimpleNamespace(model="yolov8n.pt"),
+        epoch=1,
+        tloss=[1.2],
+        label_loss_items=lambda loss, prefix: {f"{prefix}/box_loss": loss[0]},
+        metrics={"metrics/mAP50-95(B)": 0.40},
+        lr={"lr/pg0": 0.01},
+        save_dir=str(tmp_path),
+    )
+
+    tracker.on_train_start(trainer)
+    tracker.on_fit_epoch_end(trainer)
+    trainer.metrics = {"metrics/mAP50-95(B)": 0.45}  # best.pt validated in final_eval
+    tracker.on_fit_epoch_end(trainer)
+    store.flush()
+
+    run_id = tracker.run_id
+    assert store.series(run_id, "metrics/mAP50-95(B)") == [(2, 0.40)]
+    assert store.series(run_id, "final/metrics/mAP50-95(B)") == [(2, 0.45)]
+    store.close()
+
+
+# TEST 11 — writer errors surface on flush() instead of hanging it
+def test_writer_error_raised_on_flush(tmp_path):
+    path = str(tmp_path / "store.db")
+    store = MetricsStore(path, flush_interval=0.05)
+    run_id = store.start_run("p", "run-a")
+
+    other = sqlite3.connect(path)
+    other.execute("DROP TABLE metrics")
+    other.commit()
+    other.close()
+
+    store.log_metrics(run_id, 1, {"metrics/mAP50-95(B)": 0.4})
+
+    errors = []
+
+    def flush():
+        try:
+            store.flush()
+        except sqlite3.Error as exc:
+            errors.append(exc)
+
+    flusher = threading.Thread(target=flush)
+    flusher.start()
+    flusher.join(timeout=5)
+
+    assert not flusher.is_alive()
+    assert len(errors) == 1
+
+    # Error is reported once; later writes still go through the writer
+    store.log_event(run_id, "finished")
+    store.flush()
+    assert store._query("SELECT kind FROM events ORDER BY rowid") == [("started",), ("finished",)]
+    store.close()
+
+
+# TEST 12 — runs(): a sync does not replace the training status
+def test_synced_keeps_status(tmp_path):
+    store = MetricsStore(str(tmp_path / "store.db"), flush_interval=0.05)
+    run_id = store.start_run("p", "run-a")
+    store.log_event(run_id, "failed")
+    store.flush()
+    assert store.runs()[0]["synced"] is False
+
+    store.log_event(run_id, "synced")
+    store.flush()
+
+    run = store.runs()[0]
+    assert run["status"] == "failed"
+    assert run["synced"] is True
+    store.close()
+
+
+# Helper: minimal ultralytics run folder
+def create_run_dir(tmp_path):
+    run_dir = tmp_path / "yolov8n-100"
+    run_dir.mkdir()
+    (run_dir / "args.yaml").write_text("model: yolov8n.pt\nname: yolov8n-100\n")
+    (run_dir / "results.csv").write_text("epoch,metrics/mAP50-95(B)\n1,0.003\n")
+    return run_dir
+
+
+# TEST 13 — import_run_dir(): importing the same folder twice needs force
+def test_import_run_dir_idempotent(tmp_path, monkeypatch):
+    run_dir = create_run_dir(tmp_path)
+    store = MetricsStore(str(tmp_path / "store.db"))
+
+    run_id = import_run_dir(store, str(run_dir))
+    assert store.find_imported(str(run_dir)) == run_id
+
+    # Same folder spelled differently is still recognised
+    monkeypatch.chdir(tmp_path)
+    with pytest.raises(ValueError, match="already imported"):
+        import_run_dir(store, "./yolov8n-100")
+    assert len(store.runs()) == 1
+
+    forced = import_run_dir(store, str(run_dir), force=True)
+    assert forced != run_id
+    assert len(store.runs()) == 2
+    store.close()
@@ -0,0 +1,78 @@
+import numpy as np
+import pytest
+from bsort.utils import (
+    box_iou,
+    class_margin_score,
+    flip_boxes_lr,
+    max_confidence_score,
+    tta_disagreement_score,
+)
+
+
+# TEST 1 — box_iou(): identical, disjoint and half-overlapping boxes
+def test_box_iou():
+    a = [[0, 0, 10, 10]]
+    b = [[0, 0, 10, 10], [20, 20, 30, 30], [5, 0, 15, 10]]
+
+    iou = box_iou(a, b)
+
+    assert iou.shape == (1, 3)
+    assert iou[0, 0] == pytest.approx(1.0)
+    assert iou[0, 1] == pytest.approx(0.0)
+    assert iou[0, 2] == pytest.approx(50 / 150)
+
+
+# TEST 2 — flip_boxes_lr(): flipping twice returns the original boxes
+def test_flip_boxes_lr():
+    boxes = np.array([[10, 5, 30, 25]], dtype=np.float32)
+
+    flipped = flip_boxes_lr(boxes, width=100)
+
+    assert flipped.tolist() == [[70, 5, 90, 25]]
+    assert flip_boxes_lr(flipped, width=100).tolist() == boxes.tolist()
+
+
+# TEST 3 — max_confidence_score(): empty prediction is maximally uncertain
+def test_max_confidence_score():
+    assert max_confidence_score([]) == 1.0
+    assert max_confidence_score([0.2, 0.9]) == pytest.approx(0.1)
+
+
+# TEST 4 — class_margin_score(): same cap predicted as light and dark blue
+def test_class_margin_score_overlap():
+    boxes = [[0, 0, 10, 10], [0, 0, 10, 10]]
+    confs = [0.55, 0.45]
+    classes = [0, 1]
+
+    assert class_margin_score(boxes, confs, classes) == pytest.approx(0.9)
+
+
+# TEST 5 — class_margin_score(): matches the highest-IoU box, not the closest confidence
+def test_class_margin_score_highest_iou():
+    boxes = [
+        [0, 0, 10, 10],   # light_blue A1
+        [0, 0, 10, 12],   # light_blue A2
+        [0, 0, 10, 10],   # dark_blue B1: IoU 1.0 with A1
+        [0, 0, 10, 12],   # dark_blue B2: IoU 1.0 with A2, ~0.83 with A1
+    ]
+    confs = [0.9, 0.1, 0.2, 0.85]
+    classes = [0, 0, 1, 1]
+
+    # Highest IoU pairs A1-B1 and A2-B2: margins 0.7 and 0.75. Closest
+    # confidence would pair A1 with B2 instead (margin 0.05, score 0.95)
+    assert class_margin_score(boxes, confs, classes) == pytest.approx(0.3)
+
+
+# TEST 6 — class_margin_score(): no blue caps means no margin uncertainty
+def test_class_margin_score_no_blue():
+    assert class_margin_score([[0, 0, 10, 10]], [0.3], [2]) == 0.0
+
+
+# TEST 7 — tta_disagreement_score(): agreement, class flip and missing boxes
+def test_tta_disagreement_score():
+    boxes = [[0, 0, 10, 10], [20, 20, 30, 30]]
+
+    assert tta_disagreement_score(boxes, [0, 2], boxes, [0, 2]) == 0.0
+    assert tta_disagreement_score(boxes, [0, 2], boxes, [1, 2]) == pytest.approx(0.5)
+    assert tta_disagreement_score(boxes, [0, 2], [], []) == 1.0
+    assert tta_disagreement_score([], [], [], []) == 0.0